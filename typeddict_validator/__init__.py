@@ -1,12 +1,16 @@
 from .validate import (
     DictMissingKeyException,
     DictValueTypeMismatchException,
+    compile_validator,
+    validate_many,
     validate_typeddict,
 )
 
 __all__ = [
     "DictMissingKeyException",
     "DictValueTypeMismatchException",
+    "compile_validator",
+    "validate_many",
     "validate_typeddict",
 ]
 
@@ -1,13 +1,22 @@
 from typing import (
     Any,
+    Callable,
+    Literal,
+    NamedTuple,
+    Optional,
     Type,
     TypeGuard,
     TypeVar,
     Union,
     get_args,
     get_origin,
+    get_type_hints,
     is_typeddict,
 )
+import sys
+from types import SimpleNamespace
+import weakref
+from weakref import WeakKeyDictionary
 
 
 T = TypeVar("T")
@@ -18,7 +27,7 @@ def validate_typeddict(
 ) -> TypeGuard[T]:
     """Recursively validates whether the dict object matches given TypedDict.
 
-    This supports generic types and Union (including Optional).
+    This supports generic types, Union (including Optional) and Literal.
 
     Args:
         d (dict[str, Any]): a dict object to be validated.
@@ -35,66 +44,767 @@ def validate_typeddict(
     """
     if not is_typeddict(t):
         raise ValueError("t must be a type object of TypedDict.")
-    try:
-        for k, vt in t.__annotations__.items():
-            if k not in d.keys():
-                raise DictMissingKeyException(key=k)
-            _validate_value(k=k, v=d[k], expected=vt)
-    except (DictMissingKeyException, DictValueTypeMismatchException) as e:
+    if silent:
+        return _compile_checker(t)(d)
+    err = _compile_validator(t)(d)
+    if err is None:
+        return True
+    raise err
+
+
+def validate_many(
+    items: list[dict[str, Any]], t: Type[T], *, silent: bool = False
+) -> TypeGuard[list[T]]:
+    """Validates whether every dict object in the list matches given TypedDict.
+
+    This is faster than calling validate_typeddict for each item when validating a lot of dict objects.
+
+    Args:
+        items (list[dict[str, Any]]): dict objects to be validated.
+        t (Type[TypedDict]): a type object of TypedDict.
+        silent (bool): will return False instead of raising DictMissingKeyException or DictValueTypeMismatchException when True.
+
+    Returns:
+        bool: a TypeGuard that annotates all the dict objects match given TypedDict.
+
+    Raises:
+        DictMissingKeyException: raised when any dict object is missing any key defined in given TypedDict.
+        DictValueTypeMismatchException: raised when any value of any dict object does not match definition of given TypedDict.
+        ValueError: raised when argument t is not a type object of TypedDict.
+    """
+    if not is_typeddict(t):
+        raise ValueError("t must be a type object of TypedDict.")
+    if silent:
+        check = _compile_checker(t)
+        for d in items:
+            if not check(d):
+                return False
+        return True
+    fn = _compile_validator(t)
+    for d in items:
+        err = fn(d)
+        if err is not None:
+            raise err
+    return True
+
+
+def compile_validator(t: Type[T]) -> Callable[..., TypeGuard[T]]:
+    """Returns a validator function bound to given TypedDict.
+
+    The returned function takes the same arguments as validate_typeddict except t,
+    i.e. ``validator(d, silent=False)``. Use it to skip looking up given TypedDict on every call.
+    The same function is returned for the same TypedDict.
+
+    Args:
+        t (Type[TypedDict]): a type object of TypedDict.
+
+    Returns:
+        Callable[..., bool]: a function that validates a dict object against given TypedDict.
+
+    Raises:
+        ValueError: raised when argument t is not a type object of TypedDict.
+    """
+    if not is_typeddict(t):
+        raise ValueError("t must be a type object of TypedDict.")
+    validator = _bound_validators.get(t)
+    if validator is None:
+        validator = _bound_validators[t] = _bind_validator(
+            _compile_validator(t), _compile_checker(t)
+        )
+    return validator
+
+
+def _bind_validator(
+    fn: Callable[[dict[str, Any]], Optional[Exception]],
+    check: Callable[[dict[str, Any]], bool],
+) -> Callable[..., TypeGuard[Any]]:
+    def validator(d: dict[str, Any], *, silent: bool = False) -> TypeGuard[Any]:
         if silent:
-            return False
+            return check(d)
+        err = fn(d)
+        if err is None:
+            return True
+        raise err
+
+    return validator
+
+
+def _schema_plan(t: Any) -> tuple[tuple[str, Any], ...]:
+    # Resolving the hints walks the annotations and evaluates forward references.
+    # It only happens while a validator is generated, and the generated validator
+    # is what gets cached, so the result is not kept here; that would hold on to
+    # every TypedDict the WeakKeyDictionaries below are meant to let go of.
+    # The name of t is passed so that a TypedDict defined inside a function can
+    # refer to itself.
+    localns = {t.__name__: t}
+    try:
+        return tuple(get_type_hints(t, localns=localns).items())
+    except NameError:
+        pass
+    # A forward reference that is not defined in the module of t, e.g. to another
+    # TypedDict defined inside a function. Resolve the fields one by one and keep
+    # only the annotations that fail as they are; those then match no value.
+    module = sys.modules.get(t.__module__)
+    globalns = vars(module) if module is not None else {}
+    plan = []
+    for k, vt in t.__annotations__.items():
+        try:
+            hint = SimpleNamespace(__annotations__={k: vt})
+            vt = get_type_hints(hint, globalns=globalns, localns=localns)[k]
+        except NameError:
+            pass
+        plan.append((k, vt))
+    return tuple(plan)
+
+
+_MISSING = object()
+_compiled_validators: WeakKeyDictionary = WeakKeyDictionary()
+_compiled_checkers: WeakKeyDictionary = WeakKeyDictionary()
+_bound_validators: WeakKeyDictionary = WeakKeyDictionary()
+_compiling: set = set()
+
+
+def _compile_validator(t: Any) -> Callable[[dict[str, Any]], Optional[Exception]]:
+    """Returns a validator generated for given TypedDict, compiling it on first use.
+
+    The validator checks every field with straight-line code and returns the
+    DictMissingKeyException or DictValueTypeMismatchException of the first failure,
+    or None. Nothing is raised, so callers decide whether a failure is an error.
+    Fields that have no specialized code are delegated to _validate_value.
+    """
+    fn = _compiled_validators.get(t)
+    if fn is None:
+        fn, _compiled_checkers[t] = _generate_validator(t)
+        _compiled_validators[t] = fn
+    return fn
+
+
+def _compile_checker(t: Any) -> Callable[[dict[str, Any]], bool]:
+    """Returns the counterpart of _compile_validator that only tells whether the
+    dict object matches given TypedDict, without building any exception.
+    """
+    fn = _compiled_checkers.get(t)
+    if fn is None:
+        _compile_validator(t)
+        fn = _compiled_checkers[t]
+    return fn
+
+
+def _generate_validator(
+    t: Any,
+) -> tuple[
+    Callable[[dict[str, Any]], Optional[Exception]], Callable[[dict[str, Any]], bool]
+]:
+    ns: dict[str, Any] = {
+        "DictMissingKeyException": DictMissingKeyException,
+        "DictValueTypeMismatchException": DictValueTypeMismatchException,
+        "_MISSING": _MISSING,
+        "_check_args": _check_args,
+        "_check_union": _check_union,
+        "_compile_checker": _compile_checker,
+        "_compile_validator": _compile_validator,
+        "_matches_any": _matches_any,
+        "_try_validate": _try_validate,
+        "_validate_value": _validate_value,
+    }
+    body: list[_Line] = [_Guard("d")]
+    _emit_fields(body, ns, t, 0, set())
+    # _validate reads every field with a plain d[key] and leaves missing keys to a
+    # KeyError, which is free when nothing is missing. Only then the same checks
+    # run again in _validate_missing, which looks the keys up one by one to report
+    # the first failure in field order. _check runs the same checks but returns
+    # False on the first failure, for callers that do not need to know why.
+    # Subclasses of dict may define __missing__, so d[key] is only used on dicts
+    # whose class is exactly dict; anything else goes to _validate_missing.
+    lines = [
+        "def _validate_missing(d):",
+        *_render(body, "", subscript=False, fast=False),
+        "    return None",
+        "def _validate(d):",
+        "    try:",
+        *(_render(body, "    ", subscript=True, fast=False) or ["        pass"]),
+        "    except KeyError:",
+        "        return _validate_missing(d)",
+        "    return None",
+        "def _check(d):",
+        "    try:",
+        *(_render(body, "    ", subscript=True, fast=True) or ["        pass"]),
+        "    except KeyError:",
+        "        return False",
+        "    return True",
+    ]
+    code = compile("\n".join(lines), f"<typeddict:{t.__name__}>", "exec")
+    exec(code, ns)
+    return ns["_validate"], ns["_check"]
+
+
+class _Fetch(NamedTuple):
+    # A generated line that reads the field key of the dict d into _v.
+    d: str
+    key: str
+
+
+class _Fail(NamedTuple):
+    # A generated line that returns the exception error, or False in _check.
+    indent: str
+    error: str
+
+
+class _Delegate(NamedTuple):
+    # Generated lines that return the exception error evaluates to unless it is
+    # None. _check evaluates test instead, which is True when error would be None.
+    indent: str
+    error: str
+    test: str
+
+
+class _Guard(NamedTuple):
+    # Generated lines that hand a d whose class is not exactly dict over to
+    # _validate_missing, since d[key] would call __missing__ of a subclass.
+    d: str
+
+
+_Line = Union[str, _Fetch, _Fail, _Delegate, _Guard]
+
+
+def _render(lines: list[_Line], indent: str, subscript: bool, fast: bool) -> list[str]:
+    out = []
+    for line in lines:
+        if isinstance(line, str):
+            out.append(indent + line)
+        elif isinstance(line, _Fail):
+            result = "False" if fast else line.error
+            out.append(f"{indent}{line.indent}return {result}")
+        elif isinstance(line, _Delegate):
+            if fast:
+                out.append(f"{indent}{line.indent}if not {line.test}:")
+                out.append(f"{indent}{line.indent}    return False")
+            else:
+                out.append(f"{indent}{line.indent}_e = {line.error}")
+                out.append(f"{indent}{line.indent}if _e is not None:")
+                out.append(f"{indent}{line.indent}    return _e")
+        elif isinstance(line, _Guard):
+            if subscript:
+                result = "_validate_missing(d)" + (" is None" if fast else "")
+                out.append(f"{indent}    if type({line.d}) is not dict:")
+                out.append(f"{indent}        return {result}")
+        elif subscript:
+            out.append(f"{indent}    _v = {line.d}[{line.key}]")
         else:
-            raise e
-    return True
+            out.append(f"{indent}    _v = {line.d}.get({line.key}, _MISSING)")
+            out.append(f"{indent}    if _v is _MISSING:")
+            out.append(
+                f"{indent}        return DictMissingKeyException(key={line.key})"
+            )
+    return out
+
+
+def _emit_fields(
+    lines: list[_Line], ns: dict[str, Any], t: Any, depth: int, inlined: set
+):
+    # The dict being checked is d at the top level and _d<depth> when nested.
+    # inlined holds the nested TypedDicts whose checks were already inlined.
+    d = f"_d{depth}" if depth else "d"
+    _compiling.add(t)
+    try:
+        for k, vt in _schema_plan(t):
+            key = repr(k)
+            lines.append(_Fetch(d, key))
+            _emit_check(lines, ns, key, vt, depth, inlined)
+    finally:
+        _compiling.discard(t)
+
+
+# Kinds of fields in a schema plan; see _classify.
+_ANY = 0
+_PRIM = 1
+_LIST_PRIM = 2
+_DICT_PRIM = 3
+_UNION_PRIM = 4
+_TDICT = 5
+_LITERAL = 6
+_LIST_CHECK = 7
+_DICT_CHECK = 8
+_LIST_ANY = 9
+_DICT_ANY = 10
+_UNION_DISPATCH = 11
+_OTHER = 12
 
 
-def _get_args(tp: Any):
-    args = get_args(tp)
-    for arg in args:
-        if get_origin(arg) is Union:
-            return set(args + get_args(arg))
-    return set(args)
+def _classify(vt: Any) -> tuple[int, Any]:
+    """Returns the kind of given field type and the extra data its check needs.
+
+    _PRIM: a plain class compared by identity. extra is the class.
+    _LIST_PRIM, _DICT_PRIM: list or dict whose elements are plain classes. extra is a tuple of them.
+    _UNION_PRIM: Union of plain classes. extra is a tuple of them.
+    _TDICT: a nested TypedDict. extra is the TypedDict.
+    _LITERAL: Literal, or Union of Literals and plain classes. extra is a tuple of
+        the plain classes, the types of the literal values and the literal values
+        paired with their types.
+    _LIST_CHECK, _DICT_CHECK: list or dict whose elements need more than an identity
+        check. extra is a tuple of an element check function and the element types.
+    _LIST_ANY, _DICT_ANY: list or dict whose elements may be anything. extra is None.
+    _UNION_DISPATCH: Union whose arms can be told apart by the class of the value.
+        extra maps each class to True or to the check of its arm.
+    _ANY: accepts anything, including a Union with Any. extra is None.
+    _OTHER: validated by _validate_value. extra is the type itself.
+    """
+    if vt is Any:
+        return _ANY, None
+    if _is_plain_type(vt):
+        return _PRIM, vt
+    if is_typeddict(vt):
+        return _TDICT, vt
+    origin = _origin(vt)
+    if origin is list or origin is dict:
+        args = _get_element_args(vt)
+        if Any in args[1]:
+            return (_LIST_ANY if origin is list else _DICT_ANY), None
+        leaves = _plain_leaves(args[0])
+        if leaves is not None:
+            return (_LIST_PRIM if origin is list else _DICT_PRIM), leaves
+        kind = _LIST_CHECK if origin is list else _DICT_CHECK
+        return kind, (_element_check(args), args)
+    elif origin is Literal:
+        return _LITERAL, ((),) + _get_literal_values(vt)
+    elif origin is Union:
+        ordered, members = _get_args(vt)
+        if Any in members:
+            return _ANY, None
+        leaves = _plain_leaves(ordered)
+        if leaves is not None:
+            return _UNION_PRIM, leaves
+        literals = [arg for arg in ordered if _origin(arg) is Literal]
+        leaves = _plain_leaves(tuple(arg for arg in ordered if arg not in literals))
+        if literals and leaves is not None:
+            values = [value for literal in literals for value in _args(literal)]
+            pairs = frozenset((type(value), value) for value in values)
+            return _LITERAL, (leaves, frozenset(map(type, values)), pairs)
+        dispatch = _union_dispatch(ordered)
+        if dispatch is not None:
+            return _UNION_DISPATCH, dispatch
+    return _OTHER, vt
 
 
-def _validate_value(k: str, v: Any, expected: Any):
-    def raise_():
-        raise DictValueTypeMismatchException(key=k, expected=expected, actual=type(v))
+def _emit_check(
+    lines: list[_Line],
+    ns: dict[str, Any],
+    key: str,
+    vt: Any,
+    depth: int,
+    inlined: set,
+):
+    def ref(obj: Any) -> str:
+        for name, value in ns.items():
+            if value is obj:
+                return name
+        name = f"_t{len(ns)}"
+        ns[name] = obj
+        return name
 
-    origin_type_expected = get_origin(expected)
+    def mismatch(indent: str, actual: str) -> _Fail:
+        return _Fail(
+            indent,
+            f"DictValueTypeMismatchException(key={key}, expected={ref(vt)}, actual={actual})",
+        )
+
+    kind, extra = _classify(vt)
+    if kind == _ANY:
+        pass
+    elif kind == _PRIM:
+        lines.append(f"    if type(_v) is not {ref(extra)}:")
+        lines.append(mismatch("        ", "type(_v)"))
+    elif kind == _LIST_ANY or kind == _DICT_ANY:
+        container = "list" if kind == _LIST_ANY else "dict"
+        lines.append(f"    if not isinstance(_v, {container}):")
+        lines.append(mismatch("        ", "type(_v)"))
+    elif kind == _LIST_PRIM or kind == _DICT_PRIM:
+        container, elements = (
+            ("list", "_v") if kind == _LIST_PRIM else ("dict", "_v.values()")
+        )
+        lines.append(f"    if not isinstance(_v, {container}):")
+        lines.append(mismatch("        ", "type(_v)"))
+        # Empty containers skip setting up the loop, and the view of a dict.
+        lines.append("    if _v:")
+        lines.append(f"        for _x in {elements}:")
+        if len(extra) == 1:
+            # An identity test is cheaper than hashing the class into a set.
+            lines.append(f"            if type(_x) is not {ref(extra[0])}:")
+        else:
+            lines.append(f"            if type(_x) not in {ref(frozenset(extra))}:")
+        lines.append(mismatch("                ", "_v"))
+    elif kind == _LIST_CHECK or kind == _DICT_CHECK:
+        check, args = extra
+        container, elements = (
+            ("list", "_v") if kind == _LIST_CHECK else ("dict", "_v.values()")
+        )
+        lines.append(f"    if not isinstance(_v, {container}):")
+        lines.append(mismatch("        ", "type(_v)"))
+        lines.append("    if _v:")
+        lines.append(f"        for _x in {elements}:")
+        lines.append(f"            if not {ref(check)}(_x):")
+        lines.append(
+            _Fail(
+                "                ",
+                f"_check_args({key}, _x, {ref(vt)}, _v, {ref(args)})",
+            )
+        )
+    elif kind == _UNION_PRIM and len(extra) == 2 and extra[1] is type(None):
+        # Optional[X]; NoneType is always sorted last.
+        lines.append(f"    if _v is not None and type(_v) is not {ref(extra[0])}:")
+        lines.append(mismatch("        ", "_v"))
+    elif kind == _UNION_PRIM and len(extra) == 2:
+        lines.append("    _tp = type(_v)")
+        lines.append(
+            f"    if _tp is not {ref(extra[0])} and _tp is not {ref(extra[1])}:"
+        )
+        lines.append(mismatch("        ", "_v"))
+    elif kind == _UNION_PRIM:
+        # A chain of identity tests grows with every arm, a set lookup does not.
+        lines.append(f"    if type(_v) not in {ref(frozenset(extra))}:")
+        lines.append(mismatch("        ", "_v"))
+    elif kind == _LITERAL:
+        plain, literal_types, literal_pairs = extra
+        lines.append("    _tp = type(_v)")
+        cond = "".join(f"_tp is not {ref(arg)} and " for arg in plain)
+        cond += f"(_tp not in {ref(literal_types)} or (_tp, _v) not in {ref(literal_pairs)})"
+        lines.append(f"    if {cond}:")
+        lines.append(mismatch("        ", "_v"))
+    elif kind == _UNION_DISPATCH:
+        # Anything the table does not accept goes through _check_union, which
+        # also builds the error.
+        lines.append(f"    _ok = {ref(extra)}.get(type(_v))")
+        lines.append("    if _ok is not True and (_ok is None or not _ok(_v)):")
+        lines.append(
+            _Delegate(
+                "        ",
+                f"_check_union({key}, _v, {ref(vt)}, _v)",
+                f"_matches_any(_v, {ref(_get_args(vt))})",
+            )
+        )
+    elif kind == _TDICT:
+        lines.append("    if not isinstance(_v, dict):")
+        lines.append(mismatch("        ", "type(_v)"))
+        if extra in _compiling:
+            # Self-referential TypedDict; look the validator up when called.
+            lines.append(
+                _Delegate(
+                    "    ",
+                    f"_compile_validator({ref(extra)})(_v)",
+                    f"_compile_checker({ref(extra)})(_v)",
+                )
+            )
+        elif extra in inlined:
+            # Inlining a TypedDict every time it occurs makes the code grow
+            # exponentially with schemas that share it, so call its validator.
+            lines.append(
+                _Delegate(
+                    "    ",
+                    f"{ref(_compile_validator(extra))}(_v)",
+                    f"{ref(_compile_checker(extra))}(_v)",
+                )
+            )
+        else:
+            # Inline the checks of the nested TypedDict instead of calling its
+            # validator.
+            inlined.add(extra)
+            lines.append(f"    _d{depth + 1} = _v")
+            lines.append(_Guard(f"_d{depth + 1}"))
+            _emit_fields(lines, ns, extra, depth + 1, inlined)
+    else:
+        lines.append(
+            _Delegate(
+                "    ",
+                f"_validate_value(k={key}, v=_v, expected={ref(extra)})",
+                f"_try_validate(_v, {ref(extra)})",
+            )
+        )
+
+
+def _element_check(args: "_Args") -> Callable[[Any], bool]:
+    # Resolves the check of a single element once, so that the loop over the
+    # elements only makes one call each. The failure itself is built by _check_args.
+    ordered = args[0]
+    if len(ordered) == 1 and _origin(ordered[0]) is Literal:
+        literal_types, literal_pairs = _get_literal_values(ordered[0])
+        return lambda x: type(x) in literal_types and (type(x), x) in literal_pairs
+    if len(ordered) == 1 and is_typeddict(ordered[0]) and ordered[0] not in _compiling:
+        fn = _compile_checker(ordered[0])
+        return lambda x: isinstance(x, dict) and fn(x)
+    return lambda x: _matches_any(x, args)
+
+
+def _union_dispatch(arms: tuple) -> Optional[dict[type, Any]]:
+    # Maps the class of a value to the arm it can match: True for a plain class,
+    # or a check function for list, dict and TypedDict arms. None when two arms
+    # share a class or an arm cannot be checked this way.
+    dispatch: dict[type, Any] = {}
+    for arm in arms:
+        origin = _origin(arm)
+        check: Any
+        if _is_plain_type(arm):
+            cls, check = arm, True
+        elif origin is list or origin is dict:
+            cls, check = origin, _container_check(arm)
+        elif is_typeddict(arm):
+            cls, check = dict, _typeddict_check(arm)
+        else:
+            return None
+        if cls in dispatch:
+            return None
+        dispatch[cls] = check
+    return dispatch
+
+
+def _container_check(tp: Any) -> Any:
+    # Checks the elements of a value whose class already matched list or dict.
+    args = _get_element_args(tp)
+    if Any in args[1]:
+        return True
+    elements = (lambda x: x) if _origin(tp) is list else (lambda x: x.values())
+    leaves = _plain_leaves(args[0])
+    if leaves is not None:
+        members = frozenset(leaves)
+        return lambda x: not x or members.issuperset(map(type, elements(x)))
+    check = _element_check(args)
+    return lambda x: not x or all(map(check, elements(x)))
+
+
+def _typeddict_check(t: Any) -> Callable[[Any], bool]:
+    if t in _compiling:
+        return lambda x: _compile_checker(t)(x)
+    return _compile_checker(t)
+
+
+def _is_plain_type(tp: Any) -> bool:
+    return (
+        isinstance(tp, type)
+        and tp is not Any  # Any is a class since Python 3.11
+        and _origin(tp) is None
+        and not is_typeddict(tp)
+    )
+
+
+def _plain_leaves(args: tuple):
+    # args when _check_args would only compare them by identity, or None
+    # when any of them needs the generic path (generics, TypedDicts, Any, ...).
+    if all(_is_plain_type(arg) for arg in args):
+        return args
+    return None
+
+
+_TYPE_CACHE_SIZE = 1024
+_origin_cache: dict[int, tuple[Any, Any]] = {}
+_args_cache: dict[int, tuple[Any, tuple]] = {}
+# The args of a type as a tuple in checking order and as a set for membership tests.
+_Args = tuple[tuple, frozenset]
+_flat_args_cache: dict[int, tuple[Any, _Args]] = {}
+_element_args_cache: dict[int, tuple[Any, _Args]] = {}
+_literal_cache: dict[int, tuple[Any, tuple[frozenset, frozenset]]] = {}
+
+
+def _cached(cache: dict[int, tuple[Any, Any]], tp: Any, fn: Callable[[Any], Any]):
+    # Keyed by id() since not every type object is hashable. The entry refers to
+    # tp weakly and is dropped when tp is collected, so that a cached type does
+    # not keep e.g. the TypedDicts in its args alive, and its id cannot be
+    # reused while cached. The few types that do not support weak references
+    # are kept alive by their entry instead.
+    entry = cache.get(id(tp))
+    if entry is not None and entry[0]() is tp:
+        return entry[1]
+    if len(cache) >= _TYPE_CACHE_SIZE:
+        cache.clear()
+    key = id(tp)
+    try:
+        ref: Callable[[], Any] = weakref.ref(tp, lambda _: cache.pop(key, None))
+    except TypeError:
+        ref = lambda: tp
+    result = fn(tp)
+    cache[key] = (ref, result)
+    return result
+
+
+def _origin(tp: Any):
+    return _cached(_origin_cache, tp, get_origin)
+
+
+def _args(tp: Any) -> tuple:
+    return _cached(_args_cache, tp, get_args)
+
+
+def _get_args(tp: Any) -> _Args:
+    return _cached(_flat_args_cache, tp, _flatten_args)
+
+
+def _flatten_args(tp: Any) -> _Args:
+    # The args of tp with nested Unions replaced by their members, cheapest check
+    # first; arms of the same cost keep their declared order. NoneType goes last
+    # so that Optional[X] tries X, the common case, first.
+    out: list[Any] = []
+    _flatten_union(tp, out)
+    out.sort(key=_arm_cost)
+    return tuple(out), frozenset(out)
+
+
+def _arm_cost(arg: Any) -> int:
+    if arg is type(None):
+        return 4
+    if _is_plain_type(arg):
+        return 0
+    origin = _origin(arg)
+    if origin is Literal:
+        return 1
+    if origin is list or origin is dict:
+        return 2
+    return 3
+
+
+def _flatten_union(tp: Any, out: list[Any]):
+    for arg in _args(tp):
+        if _origin(arg) is Union:
+            _flatten_union(arg, out)
+        else:
+            out.append(arg)
+
+
+def _get_element_args(tp: Any) -> _Args:
+    return _cached(_element_args_cache, tp, _flatten_element_args)
+
+
+def _flatten_element_args(tp: Any) -> _Args:
+    # The accepted types of the elements of list[T] or the values of dict[K, T].
+    args = _args(tp)
+    elem = args[-1] if args else Any
+    if _origin(elem) is Union:
+        return _get_args(elem)
+    return (elem,), frozenset((elem,))
+
+
+def _get_literal_values(tp: Any) -> tuple[frozenset, frozenset]:
+    return _cached(_literal_cache, tp, _collect_literal_values)
+
+
+def _collect_literal_values(tp: Any) -> tuple[frozenset, frozenset]:
+    # Each value is paired with its type since 1 == True == 1.0, but Literal[1]
+    # must accept neither True nor 1.0. The types alone are kept as well so that
+    # values that cannot be hashed are rejected before the lookup of the pairs.
+    values = _args(tp)
+    return frozenset(map(type, values)), frozenset((type(v), v) for v in values)
+
+
+def _mismatch(k: str, v: Any, expected: Any) -> "DictValueTypeMismatchException":
+    return DictValueTypeMismatchException(key=k, expected=expected, actual=type(v))
+
+
+def _validate_value(k: str, v: Any, expected: Any) -> Optional[Exception]:
+    # Returns the exception describing the failure instead of raising it.
+    origin_type_expected = _origin(expected)
     if origin_type_expected is Union:
-        _raise_if_mismatch(k=k, v=v, expected=expected, actual=v)
-    elif origin_type_expected == list:
-        if not isinstance(v, list):
-            raise_()
-        for v_ in v:
-            _raise_if_mismatch(k=k, v=v_, expected=expected, actual=v)
-    elif origin_type_expected == dict:
+        return _check_union(k=k, v=v, expected=expected, actual=v)
+    if origin_type_expected is Literal:
+        literal_types, literal_pairs = _get_literal_values(expected)
+        if type(v) not in literal_types or (type(v), v) not in literal_pairs:
+            # Like Unions, Literals report the value rather than its type.
+            return DictValueTypeMismatchException(key=k, expected=expected, actual=v)
+        return None
+    handler = _container_handlers.get(origin_type_expected)
+    if handler is not None:
+        return handler(k, v, expected)
+    if is_typeddict(expected):
         if not isinstance(v, dict):
-            raise_()
-        for v_ in v.values():
-            _raise_if_mismatch(k=k, v=v_, expected=expected, actual=v)
-    elif is_typeddict(expected):
-        validate_typeddict(v, expected)
-    elif type(v) != expected:
-        raise_()
-
-
-def _raise_if_mismatch(k: str, v: Any, expected: Any, actual: Any):
-    args = _get_args(expected)
-    if Any in args:
-        return
-    if type(v) in args:
-        return
-    err_count = 0
-    for arg in args:
-        try:
-            _validate_value(k=k, v=v, expected=arg)
-        except DictValueTypeMismatchException:
-            err_count += 1
-    if err_count < len(args):
-        # OK if any of args did not raise error.
-        return
-    raise DictValueTypeMismatchException(key=k, expected=expected, actual=actual)
+            return _mismatch(k, v, expected)
+        return _compile_validator(expected)(v)
+    if type(v) is not expected:
+        return _mismatch(k, v, expected)
+    return None
+
+
+def _validate_list(k: str, v: Any, expected: Any) -> Optional[Exception]:
+    if not isinstance(v, list):
+        return _mismatch(k, v, expected)
+    args = _get_element_args(expected)
+    if Any in args[1]:
+        return None
+    for v_ in v:
+        err = _check_args(k=k, v=v_, expected=expected, actual=v, args=args)
+        if err is not None:
+            return err
+    return None
+
+
+def _validate_dict(k: str, v: Any, expected: Any) -> Optional[Exception]:
+    if not isinstance(v, dict):
+        return _mismatch(k, v, expected)
+    args = _get_element_args(expected)
+    if Any in args[1]:
+        return None
+    for v_ in v.values():
+        err = _check_args(k=k, v=v_, expected=expected, actual=v, args=args)
+        if err is not None:
+            return err
+    return None
+
+
+_container_handlers: dict[Any, Callable[[str, Any, Any], Optional[Exception]]] = {
+    list: _validate_list,
+    dict: _validate_dict,
+}
+
+
+def _check_union(k: str, v: Any, expected: Any, actual: Any) -> Optional[Exception]:
+    return _check_args(
+        k=k, v=v, expected=expected, actual=actual, args=_get_args(expected)
+    )
+
+
+def _check_args(
+    k: str, v: Any, expected: Any, actual: Any, args: _Args
+) -> Optional[Exception]:
+    if _matches_any(v, args):
+        return None
+    # No arm matched. Run them again with errors so that a missing key of a
+    # TypedDict arm is reported as such; this only happens on failure.
+    for arg in args[0]:
+        err = _validate_value(k=k, v=v, expected=arg)
+        if isinstance(err, DictMissingKeyException):
+            return err
+    return DictValueTypeMismatchException(key=k, expected=expected, actual=actual)
+
+
+def _matches_any(v: Any, args: _Args) -> bool:
+    ordered, members = args
+    if type(v) in members or Any in members:
+        return True
+    for arg in ordered:
+        if _try_validate(v, arg):
+            return True
+    return False
+
+
+def _try_validate(v: Any, expected: Any) -> bool:
+    # Same as _validate_value, but returns False instead of building an exception.
+    origin_type_expected = _origin(expected)
+    if origin_type_expected is Union:
+        return _matches_any(v, _get_args(expected))
+    if origin_type_expected is Literal:
+        literal_types, literal_pairs = _get_literal_values(expected)
+        return type(v) in literal_types and (type(v), v) in literal_pairs
+    if origin_type_expected is list or origin_type_expected is dict:
+        if not isinstance(v, origin_type_expected):
+            return False
+        args = _get_element_args(expected)
+        if Any in args[1]:
+            return True
+        values = v if isinstance(v, list) else v.values()
+        for v_ in values:
+            if not _matches_any(v_, args):
+                return False
+        return True
+    if is_typeddict(expected):
+        if not isinstance(v, dict):
+            return False
+        return _compile_checker(expected)(v)
+    return type(v) is expected
 
 
 class DictMissingKeyException(Exception):
@@ -104,11 +814,16 @@ class DictMissingKeyException(Exception):
         key (str): the name of missing key.
     """
 
+    __slots__ = ("key",)
+
     key: str
 
     def __init__(self, key: str) -> None:
         self.key = key
 
+    def __reduce__(self):
+        return self.__class__, (self.key,), self.__dict__
+
 
 class DictValueTypeMismatchException(Exception):
     """Indicates any value of the dict object does not match definition of given TypedDict.
@@ -119,29 +834,71 @@ class DictValueTypeMismatchException(Exception):
         expected_type_name (str): the name(s) of type(s) of expected. It will be multiple when expected is Union or Optional.
         actual (Type): the type of value of key in dict.
         actual_type_name (str): the name of type of actual.
+
+    expected_type_name and actual_type_name are computed when first read, unless they are set before.
     """
 
+    __slots__ = (
+        "key",
+        "expected",
+        "actual",
+        "_expected_type_name",
+        "_actual_type_name",
+    )
+
     key: str
     expected: Type
-    expected_type_name: str
     actual: Type
-    actual_type_name: str
 
     def __init__(self, key: str, expected: Type, actual: Type) -> None:
         self.key = key
         self.expected = expected
         self.actual = actual
-        self.expected_type_name = (
-            expected.__name__
-            if expected.__class__.__name__ == "type"
-            else expected.__class__.__name__
-        )
-        if expected == Union:
-            self.expected_type_name = "one of " + ", ".join(
-                [t.__class__.__name__ for t in expected.__args__]
+        self._expected_type_name: Optional[str] = None
+        self._actual_type_name: Optional[str] = None
+
+    def __reduce__(self):
+        # Names that were read or set are kept; the others are computed again.
+        state = dict(self.__dict__)
+        if self._expected_type_name is not None:
+            state["expected_type_name"] = self._expected_type_name
+        if self._actual_type_name is not None:
+            state["actual_type_name"] = self._actual_type_name
+        return self.__class__, (self.key, self.expected, self.actual), state
+
+    # The names are only computed when read, since most exceptions are caught
+    # (e.g. with silent=True) without ever looking at them.
+    @property
+    def expected_type_name(self) -> str:
+        if self._expected_type_name is None:
+            expected = self.expected
+            if expected == Union:
+                self._expected_type_name = "one of " + ", ".join(
+                    [t.__class__.__name__ for t in expected.__args__]
+                )
+            else:
+                self._expected_type_name = (
+                    expected.__name__
+                    if expected.__class__.__name__ == "type"
+                    else expected.__class__.__name__
+                )
+        return self._expected_type_name
+
+    @expected_type_name.setter
+    def expected_type_name(self, value: str) -> None:
+        self._expected_type_name = value
+
+    @property
+    def actual_type_name(self) -> str:
+        if self._actual_type_name is None:
+            actual = self.actual
+            self._actual_type_name = (
+                actual.__name__
+                if actual.__class__.__name__ == "type"
+                else actual.__class__.__name__
             )
-        self.actual_type_name = (
-            actual.__name__
-            if actual.__class__.__name__ == "type"
-            else actual.__class__.__name__
-        )
+        return self._actual_type_name
+
+    @actual_type_name.setter
+    def actual_type_name(self, value: str) -> None:
+        self._actual_type_name = value
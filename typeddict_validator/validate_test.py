@@ -1,9 +1,17 @@
-from typing import Any, Optional, Type, TypedDict, Union
+from collections import defaultdict
+import copy
+import gc
+import pickle
+from typing import Any, Literal, Optional, Type, TypedDict, Union
 import unittest
+import weakref
 
 from .validate import (
     DictMissingKeyException,
     DictValueTypeMismatchException,
+    _compile_validator,
+    compile_validator,
+    validate_many,
     validate_typeddict,
 )
 
@@ -28,10 +36,44 @@ class HasDictValueTypedDict(TypedDict):
     d_any: dict[str, Any]
 
 
+class HasIntDictValueTypedDict(TypedDict):
+    d: dict[str, int]
+
+
 class HasTypedDictValueTypedDict(TypedDict):
     td: BasicTypedDict
 
 
+class HasForwardRefValueTypedDict(TypedDict):
+    td: "BasicTypedDict"
+    l: "list[str]"
+
+
+class HasLiteralValueTypedDict(TypedDict):
+    l: Literal["a", "b"]
+    l_int: Literal[0, 1]
+    l_union: Union[int, Literal["a"]]
+    l_list: list[Literal["a", "b"]]
+
+
+class HasMixedLiteralValueTypedDict(TypedDict):
+    l: Literal[0, True]
+    l_list: list[Literal[1, 2]]
+    l_union: Union[str, Literal[0, True]]
+    u: Union[list[str], Literal[0, True]]
+
+
+class HasAnyValueTypedDict(TypedDict):
+    a: Any
+    o_any: Optional[Any]
+
+
+class HasNestedContainerValueTypedDict(TypedDict):
+    l_td: list[BasicTypedDict]
+    l_list: list[list[str]]
+    d_td: dict[str, BasicTypedDict]
+
+
 class HasUnionValueTypedDict(TypedDict):
     u: Union[str, int]
     o: Optional[str]
@@ -39,238 +81,790 @@ class HasUnionValueTypedDict(TypedDict):
     o_dict: Optional[dict[str, str]]
 
 
-class TestValidateTypedDict(unittest.TestCase):
+class HasWideUnionValueTypedDict(TypedDict):
+    u: Union[str, int, float]
+    o: Optional[Union[str, int]]
 
-    Param = tuple[dict[str, Any], Any]
 
-    success_params_list: list[Param] = [
+class HasTypedDictUnionValueTypedDict(TypedDict):
+    u: Union[BasicTypedDict, HasAnyValueTypedDict]
+    o_td: Optional[BasicTypedDict]
+
+
+class HasSpoofableValueTypedDict(TypedDict):
+    s: str
+    u: Union[str, int]
+    u_list: Union[str, list[int]]
+    l: list[Union[str, list[int]]]
+
+
+class SpoofedStr:
+    """Claims to be a str through __class__, which must not be trusted."""
+
+    @property  # type: ignore[misc]
+    def __class__(self):
+        return str
+
+
+Param = tuple[dict[str, Any], Any]
+
+success_params: tuple[Param, ...] = (
+    (
+        {"s": "a", "i": 0, "b": False},
+        BasicTypedDict,
+    ),
+    (
+        {
+            "l": ["a", "b"],
+            "l_union": ["a", 0],
+            "l_optional": ["a", None],
+            "l_any": ["a", False],
+        },
+        HasListValueTypedDict,
+    ),
+    (
+        {
+            "l": [],
+            "l_union": [],
+            "l_optional": [],
+            "l_any": [],
+        },
+        HasListValueTypedDict,
+    ),
+    (
+        {
+            "d": {"s": "a"},
+            "d_union": {"k1": "a", "k2": 0},
+            "d_optional": {"k1": "a", "k2": None},
+            "d_any": {"k1": "a", "k2": False},
+        },
+        HasDictValueTypedDict,
+    ),
+    (
+        {
+            "d": {},
+            "d_union": {},
+            "d_optional": {},
+            "d_any": {},
+        },
+        HasDictValueTypedDict,
+    ),
+    (
+        {"d": {"k1": 0, "k2": 1}},
+        HasIntDictValueTypedDict,
+    ),
+    (
+        {"td": {"s": "a", "i": 0, "b": False}},
+        HasTypedDictValueTypedDict,
+    ),
+    (
+        {"td": {"s": "a", "i": 0, "b": False}, "l": ["a"]},
+        HasForwardRefValueTypedDict,
+    ),
+    (
+        {
+            "l_td": [{"s": "a", "i": 0, "b": False}],
+            "l_list": [["a"], []],
+            "d_td": {"k1": {"s": "a", "i": 0, "b": False}},
+        },
+        HasNestedContainerValueTypedDict,
+    ),
+    (
+        {"u": "a", "o": "b", "o_list": ["a", "b"], "o_dict": {"s": "a"}},
+        HasUnionValueTypedDict,
+    ),
+    (
+        {"u": 0, "o": None, "o_list": None, "o_dict": None},
+        HasUnionValueTypedDict,
+    ),
+    (
+        {"u": 0.0, "o": 0},
+        HasWideUnionValueTypedDict,
+    ),
+    (
+        {"u": "a", "o": None},
+        HasWideUnionValueTypedDict,
+    ),
+    (
+        {"l": "a", "l_int": 0, "l_union": 0, "l_list": ["a", "b"]},
+        HasLiteralValueTypedDict,
+    ),
+    (
+        {"l": "b", "l_int": 1, "l_union": "a", "l_list": []},
+        HasLiteralValueTypedDict,
+    ),
+    (
+        {"l": True, "l_list": [1, 2], "l_union": 0, "u": True},
+        HasMixedLiteralValueTypedDict,
+    ),
+    (
+        {"l": 0, "l_list": [], "l_union": "a", "u": ["a"]},
+        HasMixedLiteralValueTypedDict,
+    ),
+    (
+        {"a": "a", "o_any": 0},
+        HasAnyValueTypedDict,
+    ),
+    (
+        {"a": None, "o_any": None},
+        HasAnyValueTypedDict,
+    ),
+    (
+        {"u": {"a": 0, "o_any": 0}, "o_td": None},
+        HasTypedDictUnionValueTypedDict,
+    ),
+    (
+        {
+            "u": {"s": "a", "i": 0, "b": False},
+            "o_td": {"s": "a", "i": 0, "b": False},
+        },
+        HasTypedDictUnionValueTypedDict,
+    ),
+)
+
+failure_params: tuple[tuple[Param, Type[Exception]], ...] = (
+    (
         (
-            {"s": "a", "i": 0, "b": False},
+            {},
+            dict[str, Any],  # must be a TypeDict
+        ),
+        ValueError,
+    ),
+    (
+        (
+            {"s": "a", "i": 0},  # b is missing
             BasicTypedDict,
         ),
+        DictMissingKeyException,
+    ),
+    (
+        (
+            {"s": "a", "i": 0, "b": "False"},  # b is invalid
+            BasicTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {"s": "a", "i": True, "b": False},  # i is invalid
+            BasicTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            defaultdict(int, {"s": "a", "b": False}),  # i is missing
+            BasicTypedDict,
+        ),
+        DictMissingKeyException,
+    ),
+    (
+        (
+            {"td": defaultdict(int, {"s": "a", "b": False})},  # i is missing
+            HasTypedDictValueTypedDict,
+        ),
+        DictMissingKeyException,
+    ),
+    (
+        (
+            {"s": "a", "i": 0, "b": 0},  # b is invalid
+            BasicTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
         (
             {
-                "l": ["a", "b"],
+                "l": ["a", 0],  # l is invalid
                 "l_union": ["a", 0],
                 "l_optional": ["a", None],
                 "l_any": ["a", False],
             },
             HasListValueTypedDict,
         ),
+        DictValueTypeMismatchException,
+    ),
+    (
         (
             {
-                "l": [],
-                "l_union": [],
-                "l_optional": [],
-                "l_any": [],
+                "l": ["a", "b"],
+                "l_union": ["a", 0, False],  # l_union is invalid
+                "l_optional": ["a", None],
+                "l_any": ["a", False],
             },
             HasListValueTypedDict,
         ),
+        DictValueTypeMismatchException,
+    ),
+    (
         (
             {
-                "d": {"s": "a"},
+                "l": ["a", "b"],
+                "l_union": ["a", 0],
+                "l_optional": ["a", None],
+                "l_any": {"k1": "a"},  # l_any is invalid
+            },
+            HasListValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "d": {"s": 0},  # d is invalid
                 "d_union": {"k1": "a", "k2": 0},
                 "d_optional": {"k1": "a", "k2": None},
                 "d_any": {"k1": "a", "k2": False},
             },
             HasDictValueTypedDict,
         ),
+        DictValueTypeMismatchException,
+    ),
+    (
         (
             {
-                "d": {},
-                "d_union": {},
-                "d_optional": {},
-                "d_any": {},
+                "d": {"s": "a"},
+                "d_union": {"k1": "a", "k2": False},  # d_union is invalid
+                "d_optional": {"k1": "a", "k2": None},
+                "d_any": {"k1": "a", "k2": False},
             },
             HasDictValueTypedDict,
         ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {"d": {"k1": 0, "k2": "a"}},  # d is invalid
+            HasIntDictValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
         (
-            {"td": {"s": "a", "i": 0, "b": False}},
+            {"d": {"k1": 0, "k2": True}},  # d is invalid
+            HasIntDictValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {"td": {"s": "a", "i": 0, "b": "False"}},  # b is invalid
             HasTypedDictValueTypedDict,
         ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {"td": "a"},  # td is invalid
+            HasTypedDictValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {"td": {"s": "a", "i": 0, "b": False}, "l": [0]},  # l is invalid
+            HasForwardRefValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "l_td": [{"s": "a", "i": 0}],  # b of l_td is missing
+                "l_list": [["a"], []],
+                "d_td": {"k1": {"s": "a", "i": 0, "b": False}},
+            },
+            HasNestedContainerValueTypedDict,
+        ),
+        DictMissingKeyException,
+    ),
+    (
+        (
+            {
+                "l_td": [{"s": "a", "i": 0, "b": False}],
+                "l_list": [["a"], [0]],  # l_list is invalid
+                "d_td": {"k1": {"s": "a", "i": 0, "b": False}},
+            },
+            HasNestedContainerValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
         (
-            {"u": "a", "o": "b", "o_list": ["a", "b"], "o_dict": {"s": "a"}},
+            {
+                "l_td": [{"s": "a", "i": 0, "b": False}],
+                "l_list": [["a"], []],
+                "d_td": {"k1": "a"},  # d_td is invalid
+            },
+            HasNestedContainerValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "u": False,  # u is invalid
+                "o": "b",
+                "o_list": ["a", "b"],
+                "o_dict": {"s": "a"},
+            },
             HasUnionValueTypedDict,
         ),
+        DictValueTypeMismatchException,
+    ),
+    (
         (
-            {"u": 0, "o": None, "o_list": None, "o_dict": None},
+            {
+                "u": "a",
+                "o": False,  # o is invalid
+                "o_list": ["a", "b"],
+                "o_dict": {"s": "a"},
+            },
             HasUnionValueTypedDict,
         ),
-    ]
-
-    failure_params_list: list[tuple[Param, Type[Exception]]] = [
-        (
-            (
-                {},
-                dict[str, Any],  # must be a TypeDict
-            ),
-            ValueError,
-        ),
-        (
-            (
-                {"s": "a", "i": 0},  # b is missing
-                BasicTypedDict,
-            ),
-            DictMissingKeyException,
-        ),
-        (
-            (
-                {"s": "a", "i": 0, "b": "False"},  # b is invalid
-                BasicTypedDict,
-            ),
-            DictValueTypeMismatchException,
-        ),
-        (
-            (
-                {
-                    "l": ["a", 0],  # l is invalid
-                    "l_union": ["a", 0],
-                    "l_optional": ["a", None],
-                    "l_any": ["a", False],
-                },
-                HasListValueTypedDict,
-            ),
-            DictValueTypeMismatchException,
-        ),
-        (
-            (
-                {
-                    "l": ["a", "b"],
-                    "l_union": ["a", 0, False],  # l_union is invalid
-                    "l_optional": ["a", None],
-                    "l_any": ["a", False],
-                },
-                HasListValueTypedDict,
-            ),
-            DictValueTypeMismatchException,
-        ),
-        (
-            (
-                {
-                    "d": {"s": 0},  # d is invalid
-                    "d_union": {"k1": "a", "k2": 0},
-                    "d_optional": {"k1": "a", "k2": None},
-                    "d_any": {"k1": "a", "k2": False},
-                },
-                HasDictValueTypedDict,
-            ),
-            DictValueTypeMismatchException,
-        ),
-        (
-            (
-                {
-                    "d": {"s": "a"},
-                    "d_union": {"k1": "a", "k2": False},  # d_union is invalid
-                    "d_optional": {"k1": "a", "k2": None},
-                    "d_any": {"k1": "a", "k2": False},
-                },
-                HasDictValueTypedDict,
-            ),
-            DictValueTypeMismatchException,
-        ),
-        (
-            (
-                {"td": {"s": "a", "i": 0, "b": "False"}},  # b is invalid
-                HasTypedDictValueTypedDict,
-            ),
-            DictValueTypeMismatchException,
-        ),
-        (
-            (
-                {
-                    "u": False,  # u is invalid
-                    "o": "b",
-                    "o_list": ["a", "b"],
-                    "o_dict": {"s": "a"},
-                },
-                HasUnionValueTypedDict,
-            ),
-            DictValueTypeMismatchException,
-        ),
-        (
-            (
-                {
-                    "u": "a",
-                    "o": False,  # o is invalid
-                    "o_list": ["a", "b"],
-                    "o_dict": {"s": "a"},
-                },
-                HasUnionValueTypedDict,
-            ),
-            DictValueTypeMismatchException,
-        ),
-        (
-            (
-                {
-                    "u": "a",
-                    "o": "b",
-                    "o_list": False,  # o_list is invalid
-                    "o_dict": {"s": "a"},
-                },
-                HasUnionValueTypedDict,
-            ),
-            DictValueTypeMismatchException,
-        ),
-        (
-            (
-                {
-                    "u": "a",
-                    "o": "b",
-                    "o_list": ["a", "b"],
-                    "o_dict": False,  # o_dict is invalid
-                },
-                HasUnionValueTypedDict,
-            ),
-            DictValueTypeMismatchException,
-        ),
-        (
-            (
-                {
-                    "u": "a",
-                    "o": "b",
-                    "o_list": [0],  # o_list is invalid
-                    "o_dict": {"s": "a"},
-                },
-                HasUnionValueTypedDict,
-            ),
-            DictValueTypeMismatchException,
-        ),
-        (
-            (
-                {
-                    "u": "a",
-                    "o": "b",
-                    "o_list": ["a", "b"],
-                    "o_dict": {"s": 0},  # o_dict is invalid
-                },
-                HasUnionValueTypedDict,
-            ),
-            DictValueTypeMismatchException,
-        ),
-    ]
-
-    def test_success(self):
-        for success_params in self.success_params_list:
-            with self.subTest():
-                is_valid = validate_typeddict(*success_params)
-                self.assertEqual(is_valid, True)
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "u": "a",
+                "o": "b",
+                "o_list": False,  # o_list is invalid
+                "o_dict": {"s": "a"},
+            },
+            HasUnionValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "u": "a",
+                "o": "b",
+                "o_list": ["a", "b"],
+                "o_dict": False,  # o_dict is invalid
+            },
+            HasUnionValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "u": "a",
+                "o": "b",
+                "o_list": [0],  # o_list is invalid
+                "o_dict": {"s": "a"},
+            },
+            HasUnionValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "u": "a",
+                "o": "b",
+                "o_list": ["a", "b"],
+                "o_dict": {"s": 0},  # o_dict is invalid
+            },
+            HasUnionValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {"u": True, "o": 0},  # u is invalid
+            HasWideUnionValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {"u": 0, "o": 0.0},  # o is invalid
+            HasWideUnionValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "l": "c",  # l is invalid
+                "l_int": 0,
+                "l_union": 0,
+                "l_list": ["a", "b"],
+            },
+            HasLiteralValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "l": "a",
+                "l_int": False,  # l_int is invalid
+                "l_union": 0,
+                "l_list": ["a", "b"],
+            },
+            HasLiteralValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "l": 1,  # l is invalid
+                "l_list": [1],
+                "l_union": 0,
+                "u": 0,
+            },
+            HasMixedLiteralValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "l": False,  # l is invalid
+                "l_list": [1],
+                "l_union": 0,
+                "u": 0,
+            },
+            HasMixedLiteralValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "l": 0,
+                "l_list": [1.0],  # l_list is invalid
+                "l_union": 0,
+                "u": 0,
+            },
+            HasMixedLiteralValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "l": 0,
+                "l_list": [1, True],  # l_list is invalid
+                "l_union": 0,
+                "u": 0,
+            },
+            HasMixedLiteralValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "l": 0,
+                "l_list": [1],
+                "l_union": 1,  # l_union is invalid
+                "u": 0,
+            },
+            HasMixedLiteralValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "l": 0,
+                "l_list": [1],
+                "l_union": 0,
+                "u": 1,  # u is invalid
+            },
+            HasMixedLiteralValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "l": "a",
+                "l_int": 0,
+                "l_union": "b",  # l_union is invalid
+                "l_list": ["a", "b"],
+            },
+            HasLiteralValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "l": "a",
+                "l_int": 0,
+                "l_union": 0,
+                "l_list": ["a", "c"],  # l_list is invalid
+            },
+            HasLiteralValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {"u": {"x": 0}, "o_td": None},  # u is missing keys of both TypedDicts
+            HasTypedDictUnionValueTypedDict,
+        ),
+        DictMissingKeyException,
+    ),
+    (
+        (
+            {"u": {"a": 0, "o_any": 0}, "o_td": {"s": "a"}},  # o_td is missing keys
+            HasTypedDictUnionValueTypedDict,
+        ),
+        DictMissingKeyException,
+    ),
+    (
+        (
+            {"u": {"a": 0, "o_any": 0}, "o_td": "a"},  # o_td is invalid
+            HasTypedDictUnionValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "s": SpoofedStr(),  # s is invalid
+                "u": "a",
+                "u_list": [0],
+                "l": ["a", [0]],
+            },
+            HasSpoofableValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "s": "a",
+                "u": SpoofedStr(),  # u is invalid
+                "u_list": [0],
+                "l": ["a", [0]],
+            },
+            HasSpoofableValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "s": "a",
+                "u": "a",
+                "u_list": SpoofedStr(),  # u_list is invalid
+                "l": ["a", [0]],
+            },
+            HasSpoofableValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+    (
+        (
+            {
+                "s": "a",
+                "u": "a",
+                "u_list": [0],
+                "l": [SpoofedStr()],  # l is invalid
+            },
+            HasSpoofableValueTypedDict,
+        ),
+        DictValueTypeMismatchException,
+    ),
+)
+
+
+def expand_params(cls: Type[unittest.TestCase]) -> Type[unittest.TestCase]:
+    """Attaches one test method per row of success_params and failure_params.
+
+    The i-th row is run as test_success_<i> or test_failure_<i>, which call the
+    check_success or check_failure method of cls with it.
+    """
+    for i, params in enumerate(success_params):
+        setattr(cls, f"test_success_{i}", _row_test("check_success", params))
+    for i, (params, error) in enumerate(failure_params):
+        setattr(cls, f"test_failure_{i}", _row_test("check_failure", (*params, error)))
+    return cls
 
-    def test_success_with_silent(self):
-        for success_params in self.success_params_list:
-            with self.subTest():
-                is_valid = validate_typeddict(*success_params, silent=True)
-                self.assertEqual(is_valid, True)
 
-    def test_failure(self):
-        for failure_params, error in self.failure_params_list:
+def _row_test(check: str, args: tuple):
+    def test(self):
+        getattr(self, check)(*args)
+
+    return test
+
+
+@expand_params
+class TestValidateTypedDict(unittest.TestCase):
+    def check_success(self, d: dict[str, Any], t: Any):
+        self.assertEqual(validate_typeddict(d, t), True)
+        self.assertEqual(validate_typeddict(d, t, silent=True), True)
+
+    def check_failure(self, d: dict[str, Any], t: Any, error: Type[Exception]):
+        with self.assertRaises(error):
+            validate_typeddict(d, t)
+        if error == ValueError:
+            return
+        self.assertEqual(validate_typeddict(d, t, silent=True), False)
+
+    def test_validate_many(self):
+        for d, t in success_params:
+            with self.subTest():
+                self.assertEqual(validate_many([d, d], t), True)
+                self.assertEqual(validate_many([d, d], t, silent=True), True)
+        for (d, t), error in failure_params:
             with self.subTest():
                 with self.assertRaises(error):
-                    validate_typeddict(*failure_params)
+                    validate_many([d], t)
+                if error == ValueError:
+                    continue
+                self.assertEqual(validate_many([d], t, silent=True), False)
 
-    def test_failure_with_silent(self):
-        for failure_params, error in self.failure_params_list:
+    def test_compile_validator(self):
+        for d, t in success_params:
+            with self.subTest():
+                validator = compile_validator(t)
+                self.assertIs(compile_validator(t), validator)
+                self.assertEqual(validator(d), True)
+                self.assertEqual(validator(d, silent=True), True)
+        for (d, t), error in failure_params:
             with self.subTest():
+                with self.assertRaises(error):
+                    compile_validator(t)(d)
                 if error == ValueError:
                     continue
-                is_valid = validate_typeddict(*failure_params, silent=True)
-                self.assertEqual(is_valid, False)
+                self.assertEqual(compile_validator(t)(d, silent=True), False)
+
+    def test_mismatch_exception_attributes(self):
+        with self.assertRaises(DictValueTypeMismatchException) as cm:
+            validate_typeddict({"s": "a", "i": 0, "b": "False"}, BasicTypedDict)
+        self.assertEqual(cm.exception.key, "b")
+        self.assertEqual(cm.exception.expected_type_name, "bool")
+        self.assertEqual(cm.exception.actual_type_name, "str")
+        d = {"l": "c", "l_int": 0, "l_union": 0, "l_list": []}
+        with self.assertRaises(DictValueTypeMismatchException) as cm:
+            validate_typeddict(d, HasLiteralValueTypedDict)
+        self.assertEqual(cm.exception.key, "l")
+        self.assertEqual(cm.exception.actual, "c")
+        self.assertEqual(cm.exception.actual_type_name, "str")
+        d = {"l": "a", "l_int": 0, "l_union": "b", "l_list": []}
+        with self.assertRaises(DictValueTypeMismatchException) as cm:
+            validate_typeddict(d, HasLiteralValueTypedDict)
+        self.assertEqual(cm.exception.key, "l_union")
+        self.assertEqual(cm.exception.actual, "b")
+        self.assertEqual(cm.exception.actual_type_name, "str")
+
+    def test_exceptions_can_be_modified_and_copied(self):
+        e = DictValueTypeMismatchException(key="i", expected=int, actual=str)
+        e.expected_type_name = "integer"
+        e.note = "from the request body"
+        for e_ in (copy.copy(e), copy.deepcopy(e), pickle.loads(pickle.dumps(e))):
+            self.assertEqual(e_.key, "i")
+            self.assertEqual(e_.expected, int)
+            self.assertEqual(e_.expected_type_name, "integer")
+            self.assertEqual(e_.actual, str)
+            self.assertEqual(e_.actual_type_name, "str")
+            self.assertEqual(e_.note, "from the request body")
+        e_ = pickle.loads(pickle.dumps(DictMissingKeyException(key="s")))
+        self.assertEqual(e_.key, "s")
+
+    def test_annotations_are_not_mutated(self):
+        annotations = dict(HasForwardRefValueTypedDict.__annotations__)
+        validate_typeddict(
+            {"td": {"s": "a", "i": 0, "b": False}, "l": ["a"]},
+            HasForwardRefValueTypedDict,
+        )
+        self.assertEqual(HasForwardRefValueTypedDict.__annotations__, annotations)
+
+    def test_result_is_not_cached(self):
+        d = {"s": "a", "i": 0, "b": False}
+        self.assertEqual(validate_typeddict(d, BasicTypedDict), True)
+        d["i"] = "0"
+        self.assertEqual(validate_typeddict(d, BasicTypedDict, silent=True), False)
+        del d["i"]
+        with self.assertRaises(DictMissingKeyException):
+            validate_typeddict(d, BasicTypedDict)
+
+    def test_validators_do_not_keep_typeddict_alive(self):
+        class InnerTypedDict(TypedDict):
+            s: str
+
+        class LocalTypedDict(TypedDict):
+            s: str
+            td: InnerTypedDict
+            l_td: list[InnerTypedDict]
+            d_td: dict[str, InnerTypedDict]
+
+        d = {"s": "a", "td": {"s": "a"}, "l_td": [{"s": "a"}], "d_td": {"k": {}}}
+        self.assertEqual(validate_typeddict(d, LocalTypedDict, silent=True), False)
+        with self.assertRaises(DictMissingKeyException):
+            validate_typeddict(d, LocalTypedDict)
+        d["d_td"] = {"k": {"s": "a"}}
+        self.assertEqual(validate_typeddict(d, LocalTypedDict), True)
+        self.assertEqual(compile_validator(LocalTypedDict)(d), True)
+        refs = [weakref.ref(LocalTypedDict), weakref.ref(InnerTypedDict)]
+        del LocalTypedDict, InnerTypedDict
+        # Each pass may only release what the previous one left unreferenced.
+        while gc.collect():
+            pass
+        self.assertEqual([ref() for ref in refs], [None, None])
+
+    def test_shared_nested_typeddict_is_compiled_once(self):
+        # Each level has two fields of the same child type, so inlining every
+        # occurrence would generate code exponential in the depth.
+        child: Any = TypedDict("Level0TypedDict", {"s": str})
+        valid: dict[str, Any] = {"s": "a"}
+        invalid: dict[str, Any] = {"s": 0}
+        depth = 12
+        for i in range(1, depth + 1):
+            child = TypedDict(f"Level{i}TypedDict", {"a": child, "b": child})
+            valid, invalid = {"a": valid, "b": valid}, {"a": valid, "b": invalid}
+        self.assertEqual(validate_typeddict(valid, child), True)
+        code = _compile_validator(child).__code__
+        self.assertLess(len({line for *_, line in code.co_lines()}), 20 * depth)
+        self.assertEqual(validate_typeddict(invalid, child, silent=True), False)
+        with self.assertRaises(DictValueTypeMismatchException) as cm:
+            validate_typeddict(invalid, child)
+        self.assertEqual(cm.exception.key, "s")
+
+    def test_local_forward_ref(self):
+        class LocalTypedDict(TypedDict):
+            s: "str"
+            r: Optional["LocalTypedDict"]
+
+        for d in ({"s": "a", "r": None}, {"s": "a", "r": {"s": "b", "r": None}}):
+            with self.subTest():
+                self.assertEqual(validate_typeddict(d, LocalTypedDict), True)
+                self.assertEqual(
+                    validate_typeddict(d, LocalTypedDict, silent=True), True
+                )
+        d = {"s": "a", "r": {"s": 0, "r": None}}
+        self.assertEqual(validate_typeddict(d, LocalTypedDict, silent=True), False)
+        with self.assertRaises(DictValueTypeMismatchException):
+            validate_typeddict(d, LocalTypedDict)
+
+    def test_unresolved_forward_ref(self):
+        class LocalTypedDict(TypedDict):
+            s: "str"
+            o: Optional["InnerTypedDict"]
+
+        class InnerTypedDict(TypedDict):
+            s: str
+
+        d: dict[str, Any] = {"s": "a", "o": None}
+        self.assertEqual(validate_typeddict(d, LocalTypedDict), True)
+        self.assertEqual(validate_typeddict(d, LocalTypedDict, silent=True), True)
+        # Only the field with the unresolved reference stops matching.
+        d = {"s": 0, "o": None}
+        with self.assertRaises(DictValueTypeMismatchException) as cm:
+            validate_typeddict(d, LocalTypedDict)
+        self.assertEqual(cm.exception.key, "s")
+        d = {"s": "a", "o": {"s": "a"}}
+        self.assertEqual(validate_typeddict(d, LocalTypedDict, silent=True), False)
+        with self.assertRaises(DictValueTypeMismatchException) as cm:
+            validate_typeddict(d, LocalTypedDict)
+        self.assertEqual(cm.exception.key, "o")